@@ -6,21 +6,28 @@ import numpy as np
 
 
 def find_fringe_spacing(gray: np.ndarray):
-    profile = np.mean(gray, axis=0)
-    profile = profile - np.min(profile)
-    max_val = np.max(profile)
-    if max_val > 0:
-        profile = profile / max_val
+    profile = cv2.reduce(gray, 0, cv2.REDUCE_AVG, dtype=cv2.CV_32F).ravel()
+    # In-place min/max scale to [0, 1]; a flat profile becomes all zeros.
+    cv2.normalize(profile, profile, 0.0, 1.0, cv2.NORM_MINMAX)
 
     threshold = 0.35
-    peaks = []
-    for i in range(1, len(profile) - 1):
-        val = profile[i]
-        if val >= profile[i - 1] and val >= profile[i + 1] and val >= threshold:
-            if not peaks or i - peaks[-1] > 2:
-                peaks.append(i)
-
-    spacings = [peaks[i] - peaks[i - 1] for i in range(1, len(peaks)) if peaks[i] - peaks[i - 1] > 1]
+    center = profile[1:-1]
+    candidates = np.flatnonzero(
+        (center >= profile[:-2]) & (center >= profile[2:]) & (center >= threshold)
+    ) + 1
+    if candidates.size < 2 or np.all(np.diff(candidates) > 2):
+        peaks = candidates
+    else:
+        # Plateaus and near-duplicates: keep the first candidate of each
+        # cluster, measured from the last accepted peak.
+        kept = [candidates[0]]
+        for i in candidates[1:]:
+            if i - kept[-1] > 2:
+                kept.append(i)
+        peaks = np.asarray(kept)
+
+    spacings = np.diff(peaks)
+    spacings = spacings[spacings > 1]
     if len(spacings) < 2:
         return None, peaks
 
@@ -46,29 +53,35 @@ def main():
         return
 
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    edges = cv2.Canny(gray, 50, 150)
     spacing, peaks = find_fringe_spacing(gray)
 
     overlay_saved = False
     if overlay_path:
+        edges = cv2.Canny(gray, 50, 150)
         overlay = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
         cv2.addWeighted(image, 0.6, overlay, 0.4, 0, overlay)
-        if peaks:
-            for idx, x in enumerate(peaks):
-                cv2.line(overlay, (x, 0), (x, overlay.shape[0] - 1), (0, 255, 0), 1)
-                if idx > 0:
-                    gap = peaks[idx] - peaks[idx - 1]
-                    label_y = 18 + (idx % 2) * 14
-                    cv2.putText(
-                        overlay,
-                        f"{gap}px",
-                        (int((peaks[idx] + peaks[idx - 1]) / 2), label_y),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.45,
-                        (255, 0, 0),
-                        1,
-                        cv2.LINE_AA,
-                    )
+        if peaks.size:
+            xs = peaks.astype(np.int32)
+            # One 2-point polyline per peak, drawn in a single call.
+            lines = np.empty((xs.size, 2, 2), np.int32)
+            lines[:, :, 0] = xs[:, None]
+            lines[:, 0, 1] = 0
+            lines[:, 1, 1] = overlay.shape[0] - 1
+            cv2.polylines(overlay, list(lines), False, (0, 255, 0), 1)
+
+            gaps = np.diff(peaks).tolist()
+            mids = ((peaks[1:] + peaks[:-1]) // 2).tolist()
+            for idx, (gap, mid) in enumerate(zip(gaps, mids), start=1):
+                cv2.putText(
+                    overlay,
+                    f"{gap}px",
+                    (mid, 18 + (idx % 2) * 14),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.45,
+                    (255, 0, 0),
+                    1,
+                    cv2.LINE_AA,
+                )
         cv2.imwrite(overlay_path, overlay)
         overlay_saved = True
 
@@ -76,7 +89,7 @@ def main():
         json.dumps(
             {
                 "fringe_spacing_px": spacing,
-                "peaks": peaks,
+                "peaks": peaks.tolist(),
                 "overlay_saved": overlay_saved,
             }
         )
@@ -20,13 +20,17 @@ Dependencies:
 
 Run:
   python3 measure_fringes.py --cli
-  python3 measure_fringes.py --popup   (macOS AppleScript dialogs; may crash on some setups)
+  python3 measure_fringes.py --popup   (AppleScript dialogs on macOS, Tk elsewhere)
 """
 
 import os
+import sys
 import csv
 import math
 import argparse
+import contextlib
+import functools
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import cv2
 import subprocess
@@ -67,63 +71,127 @@ def build_ui(mode: str):
     def warn_cli(msg: str, title: str = "Warning"):
         print(f"[{title}] {msg}")
 
-    # ---- Popup (AppleScript) versions ----
-    def _run_osascript(script: str) -> str:
-        p = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
-        if p.returncode != 0:
-            raise RuntimeError(p.stderr.strip() or "Dialog cancelled")
-        return p.stdout.strip()
+    if mode == "cli":
+        return pick_file_cli, pick_folder_cli, ask_float_cli, info_cli, warn_cli
+
+    # ---- Popup (AppleScript) versions, macOS ----
+    # Kept out of process: calibration opens OpenCV's Cocoa highgui window
+    # between dialogs, and Tk in the same process would share (and set up)
+    # the one NSApplication with it, which is a known source of hangs.
+    if sys.platform == "darwin":
+        def _run_osascript(script: str) -> str:
+            p = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
+            if p.returncode != 0:
+                raise RuntimeError(p.stderr.strip() or "Dialog cancelled")
+            return p.stdout.strip()
+
+        def pick_file_popup(title: str, filetypes=None):
+            try:
+                script = f"""
+                set theFile to choose file with prompt {shlex.quote(title)}
+                POSIX path of theFile
+                """
+                return _run_osascript(script)
+            except Exception:
+                return None
+
+        def pick_folder_popup(title: str):
+            try:
+                script = f"""
+                set theFolder to choose folder with prompt {shlex.quote(title)}
+                POSIX path of theFolder
+                """
+                return _run_osascript(script)
+            except Exception:
+                return None
+
+        def ask_float_popup(title: str, prompt: str, initial=None):
+            try:
+                default_txt = "" if initial is None else str(initial)
+                script = f"""
+                set theAnswer to text returned of (display dialog {shlex.quote(prompt)} with title {shlex.quote(title)} default answer {shlex.quote(default_txt)})
+                theAnswer
+                """
+                s = _run_osascript(script)
+                return float(s)
+            except Exception:
+                return None
+
+        def info_popup(msg: str, title: str = "Info"):
+            try:
+                script = f'display dialog {shlex.quote(msg)} with title {shlex.quote(title)} buttons {{"OK"}} default button "OK"'
+                _run_osascript(script)
+            except Exception:
+                pass
+
+        def warn_popup(msg: str, title: str = "Warning"):
+            try:
+                script = f'display dialog {shlex.quote(msg)} with title {shlex.quote(title)} buttons {{"OK"}} default button "OK" with icon caution'
+                _run_osascript(script)
+            except Exception:
+                pass
+
+        return pick_file_popup, pick_folder_popup, ask_float_popup, info_popup, warn_popup
+
+    # ---- Popup (Tk) versions, other platforms ----
+    # In-process dialogs. Each gets a short-lived hidden root that is destroyed
+    # afterwards, so no Tk app is alive while OpenCV highgui windows are open
+    # or when the batch pool forks.
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, simpledialog
+
+    @contextlib.contextmanager
+    def _dialog_root():
+        root = tk.Tk()
+        root.withdraw()
+        try:
+            yield root
+        finally:
+            root.destroy()
 
     def pick_file_popup(title: str, filetypes=None):
         try:
-            script = f"""
-            set theFile to choose file with prompt {shlex.quote(title)}
-            POSIX path of theFile
-            """
-            return _run_osascript(script)
+            with _dialog_root() as root:
+                p = filedialog.askopenfilename(parent=root, title=title, filetypes=filetypes or [])
+            return p or None
         except Exception:
             return None
 
     def pick_folder_popup(title: str):
         try:
-            script = f"""
-            set theFolder to choose folder with prompt {shlex.quote(title)}
-            POSIX path of theFolder
-            """
-            return _run_osascript(script)
+            with _dialog_root() as root:
+                p = filedialog.askdirectory(parent=root, title=title)
+            return p or None
         except Exception:
             return None
 
     def ask_float_popup(title: str, prompt: str, initial=None):
+        # askstring rather than askfloat: a blank answer must mean "skip", not re-prompt
         try:
             default_txt = "" if initial is None else str(initial)
-            script = f"""
-            set theAnswer to text returned of (display dialog {shlex.quote(prompt)} with title {shlex.quote(title)} default answer {shlex.quote(default_txt)})
-            theAnswer
-            """
-            s = _run_osascript(script)
+            with _dialog_root() as root:
+                s = simpledialog.askstring(title, prompt, initialvalue=default_txt, parent=root)
+            if not s or not s.strip():
+                return None
             return float(s)
         except Exception:
             return None
 
     def info_popup(msg: str, title: str = "Info"):
         try:
-            script = f'display dialog {shlex.quote(msg)} with title {shlex.quote(title)} buttons {{"OK"}} default button "OK"'
-            _run_osascript(script)
+            with _dialog_root() as root:
+                messagebox.showinfo(title, msg, parent=root)
         except Exception:
             pass
 
     def warn_popup(msg: str, title: str = "Warning"):
         try:
-            script = f'display dialog {shlex.quote(msg)} with title {shlex.quote(title)} buttons {{"OK"}} default button "OK" with icon caution'
-            _run_osascript(script)
+            with _dialog_root() as root:
+                messagebox.showwarning(title, msg, parent=root)
         except Exception:
             pass
 
-    if mode == "cli":
-        return pick_file_cli, pick_folder_cli, ask_float_cli, info_cli, warn_cli
-    else:
-        return pick_file_popup, pick_folder_popup, ask_float_popup, info_popup, warn_popup
+    return pick_file_popup, pick_folder_popup, ask_float_popup, info_popup, warn_popup
 
 
 # -----------------------------
@@ -194,6 +262,22 @@ def mm_per_px_from_calibration(calib_path, ask_float):
 # -----------------------------
 # Fringe spacing estimation
 # -----------------------------
+def _next_fast_len(n):
+    """Smallest 5-smooth integer >= n (cheap FFT size, usually well below next pow-2)."""
+    best = 1 << max(0, (n - 1).bit_length())
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            m = p35
+            while m < n:
+                m *= 2
+            best = min(best, m)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
 def estimate_fringe_spacing_px(image_bgr):
     """
     Returns (spacing_px, debug_edges_bgr) or (None, debug_edges_bgr)
@@ -208,7 +292,7 @@ def estimate_fringe_spacing_px(image_bgr):
     edges = cv2.Canny(gray, 50, 150)
     edges_vis = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
 
-    profile = edges.sum(axis=0).astype(np.float32)
+    profile = cv2.reduce(edges, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel().astype(np.float32)
     if profile.size < 50 or profile.max() <= 0:
         return None, edges_vis
 
@@ -216,16 +300,18 @@ def estimate_fringe_spacing_px(image_bgr):
     if np.allclose(profile, 0):
         return None, edges_vis
 
-    n = int(2 ** math.ceil(math.log2(len(profile) * 2)))
-    f = np.fft.rfft(profile, n=n)
-    ac = np.fft.irfft(f * np.conj(f), n=n)[: len(profile)]
-    ac[0] = 0
-
     min_lag = max(5, int(len(profile) * 0.01))
     max_lag = min(len(profile) - 1, int(len(profile) * 0.5))
     if max_lag <= min_lag + 2:
         return None, edges_vis
 
+    # only lags < max_lag are used; zero-padding to N + max_lag keeps those
+    # free of circular wrap-around without paying for the full 2N-1 length
+    n = _next_fast_len(len(profile) + max_lag)
+    f = np.fft.rfft(profile, n=n)
+    ac = np.fft.irfft(f * np.conj(f), n=n)[:max_lag]
+    ac[0] = 0
+
     segment = ac[min_lag:max_lag]
     lag = int(np.argmax(segment) + min_lag)
 
@@ -259,13 +345,62 @@ def iter_images(root_dir):
                 yield os.path.join(dirpath, fn)
 
 
+def _init_worker(cv_threads):
+    # Parallelism comes from the process pool; one OpenCV thread per worker
+    # keeps workers x threads <= cores instead of cores^2.
+    cv2.setNumThreads(cv_threads)
+
+
+def _process_one(path, root_dir, out_dir, mm_per_px, wavelength_nm, slit_to_screen_mm):
+    """
+    Analyze one image and write its overlay/edges images.
+    Returns the CSV row, or None if the image could not be read.
+    Runs in a worker process, so it must stay a top-level function.
+    """
+    img = cv2.imread(path, cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+
+    spacing_px, edges_vis = estimate_fringe_spacing_px(img)
+    spacing_mm = None
+    slit_width_mm = None
+
+    if spacing_px is not None:
+        spacing_mm = spacing_px * mm_per_px
+
+        if wavelength_nm is not None and slit_to_screen_mm is not None and spacing_mm > 0:
+            wavelength_mm = wavelength_nm * 1e-6  # nm -> mm
+            slit_width_mm = (wavelength_mm * slit_to_screen_mm) / spacing_mm
+
+        overlay = draw_overlay_lines(img, spacing_px)
+        rel = os.path.relpath(path, root_dir).replace(os.sep, "__")
+        cv2.imwrite(os.path.join(out_dir, f"overlay__{rel}.png"), overlay)
+        cv2.imwrite(os.path.join(out_dir, f"edges__{rel}.png"), edges_vis)
+
+    return {
+        "image_path": os.path.relpath(path, root_dir),
+        "spacing_px": "" if spacing_px is None else f"{spacing_px:.3f}",
+        "spacing_mm": "" if spacing_mm is None else f"{spacing_mm:.6f}",
+        "slit_width_mm": "" if slit_width_mm is None else f"{slit_width_mm:.6f}",
+    }
+
+
 def main():
     parser = argparse.ArgumentParser()
     g = parser.add_mutually_exclusive_group()
     g.add_argument("--cli", action="store_true", help="Use command-line prompts (no popups)")
-    g.add_argument("--popup", action="store_true", help="Use macOS popups (AppleScript)")
+    g.add_argument("--popup", action="store_true", help="Use popup dialogs (AppleScript on macOS, Tk elsewhere)")
     args = parser.parse_args()
 
+    # OpenCV threads per batch worker; validated here so a bad value fails
+    # with a clear message instead of a BrokenProcessPool later.
+    try:
+        cv_threads = int(os.getenv("CV_THREADS", "1"))
+    except ValueError:
+        cv_threads = 0
+    if cv_threads < 1:
+        parser.error(f"CV_THREADS must be a positive integer, got {os.getenv('CV_THREADS')!r}")
+
     mode = "cli" if args.cli else "popup"  # default popup
     pick_file, pick_folder, ask_float, info, warn = build_ui(mode)
 
@@ -309,10 +444,7 @@ def main():
     os.makedirs(out_dir, exist_ok=True)
     csv_path = os.path.join(out_dir, "fringe_analysis.csv")
 
-    rows = []
-    count = 0
-    ok = 0
-
+    paths = []
     for path in iter_images(root_dir):
         # skip analysis output folder
         try:
@@ -320,37 +452,22 @@ def main():
                 continue
         except Exception:
             pass
+        paths.append(path)
+
+    # Images are independent; analyze them in parallel, one per core.
+    process_one = functools.partial(
+        _process_one,
+        root_dir=root_dir,
+        out_dir=out_dir,
+        mm_per_px=mm_per_px,
+        wavelength_nm=wavelength_nm,
+        slit_to_screen_mm=slit_to_screen_mm,
+    )
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(cv_threads,)) as ex:
+        rows = [r for r in ex.map(process_one, paths, chunksize=4) if r is not None]
 
-        img = cv2.imread(path, cv2.IMREAD_COLOR)
-        if img is None:
-            continue
-
-        count += 1
-        spacing_px, edges_vis = estimate_fringe_spacing_px(img)
-        spacing_mm = None
-        slit_width_mm = None
-
-        if spacing_px is not None:
-            ok += 1
-            spacing_mm = spacing_px * mm_per_px
-
-            if wavelength_nm is not None and slit_to_screen_mm is not None and spacing_mm > 0:
-                wavelength_mm = wavelength_nm * 1e-6  # nm -> mm
-                slit_width_mm = (wavelength_mm * slit_to_screen_mm) / spacing_mm
-
-            overlay = draw_overlay_lines(img, spacing_px)
-            rel = os.path.relpath(path, root_dir).replace(os.sep, "__")
-            cv2.imwrite(os.path.join(out_dir, f"overlay__{rel}.png"), overlay)
-            cv2.imwrite(os.path.join(out_dir, f"edges__{rel}.png"), edges_vis)
-
-        rows.append(
-            {
-                "image_path": os.path.relpath(path, root_dir),
-                "spacing_px": "" if spacing_px is None else f"{spacing_px:.3f}",
-                "spacing_mm": "" if spacing_mm is None else f"{spacing_mm:.6f}",
-                "slit_width_mm": "" if slit_width_mm is None else f"{slit_width_mm:.6f}",
-            }
-        )
+    count = len(rows)
+    ok = sum(1 for r in rows if r["spacing_px"])
 
     with open(csv_path, "w", newline="") as f:
         writer = csv.DictWriter(